@@ -0,0 +1,103 @@
+# bench_gcode.py
+# Mede a taxa de interpretação de G-code (linhas/s) sem hardware,
+# comparando com o interpretador original (split + if/elif).
+# As linhas sem espaços e com N + checksum passam pelo tokenizador
+# completo / pelo XOR do checksum, que o original não tem (ele ignora
+# essas linhas em silêncio), por isso não são comparáveis 1:1.
+#
+# Uso: python bench_gcode.py [linhas]
+
+import sys
+import time
+from gcode_interpreter import GCodeInterpreter
+
+
+class NullServos:
+    """Substitui Servos: descarta os movimentos"""
+    def position_all(self, positions):
+        pass
+
+    def get_position(self, index):
+        return 0
+
+
+def legacy_parser(gcode):
+    """
+    parse_command original (split + if/elif), referência. Usa o mesmo
+    move_to do interpretador, para que só a interpretação seja comparada.
+    """
+    def parse_command(command):
+        parts = command.upper().split()
+        if not parts:
+            return
+        
+        if parts[0] in ['G0', 'G1']:
+            positions = {}
+            for part in parts[1:]:
+                if part[0] in ['X', 'Y', 'Z']:
+                    axis = part[0]
+                    value = float(part[1:])
+                    limits = gcode.axis_limits[axis]
+                    if value < limits['min'] or value > limits['max']:
+                        raise ValueError(f"Posição {value} fora dos limites para eixo {axis}")
+                    positions[axis] = value
+            
+            gcode.move_to(positions)
+            
+        elif parts[0] == 'G28':
+            gcode.home()
+            
+        elif parts[0] == 'M114':
+            return gcode.get_position()
+    return parse_command
+
+
+def make_program(count):
+    lines = []
+    for i in range(count):
+        line = f"N{i + 1} G1 X{i % 100}.5 Y{40 + i % 100} Z{60 + i % 50}"
+        checksum = 0
+        for c in line.encode():
+            checksum ^= c
+        lines.append(f"{line}*{checksum}")
+    return lines
+
+
+def bench(cases, rounds=7):
+    """
+    Mede cada caso (rótulo, função, linhas, preparo), alternando os casos a
+    cada rodada e guardando o melhor tempo, para reduzir o ruído da máquina
+    """
+    best = [None] * len(cases)
+    for _ in range(rounds):
+        for i, (label, func, lines, setup) in enumerate(cases):
+            if setup is not None:
+                setup()
+            start = time.perf_counter()
+            for line in lines:
+                func(line)
+            elapsed = time.perf_counter() - start
+            if best[i] is None or elapsed < best[i]:
+                best[i] = elapsed
+    reference = None
+    for (label, func, lines, setup), elapsed in zip(cases, best):
+        rate = len(lines) / elapsed
+        if reference is None:
+            reference = rate
+        print(f"{label:<32}{rate:>12.0f} linhas/s{rate / reference:>8.2f}x")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    program = make_program(count)
+    plain = [line.split(' ', 1)[1].split('*')[0] for line in program]
+    compact = [line.replace(' ', '') for line in plain]
+
+    gcode = GCodeInterpreter(NullServos())
+    bench([
+        ("original (referência)", legacy_parser(gcode), plain, None),
+        ("parse_command", gcode.parse_command, plain, None),
+        ("parse_command (sem espaços)", gcode.parse_command, compact, None),
+        ("parse_command (N + checksum)", gcode.parse_command, program,
+         lambda: gcode.parse_command("M110 N0")),
+    ])
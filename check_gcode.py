@@ -0,0 +1,168 @@
+# check_gcode.py
+# Verificação do interpretador G-code sem hardware: checksum, número de
+# linha (N), M110, comentários, vários comandos por linha e colunas de erro.
+#
+# Uso: python check_gcode.py
+
+from gcode_interpreter import GCodeInterpreter, GCodeError
+
+
+class RecordingServos:
+    """Substitui Servos: registra os movimentos recebidos"""
+    def __init__(self):
+        self.moves = []
+
+    def position_all(self, positions):
+        self.moves.append(dict(positions))
+
+    def get_position(self, index):
+        return 0
+
+
+def with_checksum(line):
+    checksum = 0
+    for c in line.encode():
+        checksum ^= c
+    return f"{line}*{checksum}"
+
+
+failures = 0
+
+
+def check(label, condition):
+    global failures
+    if not condition:
+        failures += 1
+    print(f"{'ok  ' if condition else 'FALHA'} {label}")
+
+
+def expect_error(gcode, line, column, text=None):
+    """Executa a linha esperando GCodeError na coluna indicada"""
+    try:
+        gcode.parse_command(line)
+    except GCodeError as e:
+        ok = e.column == column and (text is None or text in e.message)
+        check(f"{line!r} -> {e}", ok)
+        return
+    check(f"{line!r} deveria falhar", False)
+
+
+def new_interpreter():
+    servos = RecordingServos()
+    return GCodeInterpreter(servos), servos
+
+
+if __name__ == "__main__":
+    # Movimento simples, minúsculas, F ignorado e comentários
+    gcode, servos = new_interpreter()
+    gcode.parse_command("g1 x10 Y30.5 F100 ; comentário")
+    check("G1 move X e Y", servos.moves == [{2: 10.0, 1: 30.5}])
+    check("F não entra na posição atual", 'F' not in gcode.current_position)
+    gcode.parse_command("G0 (meio) Z90 (fim)")
+    check("comentário entre parênteses", servos.moves[-1] == {0: 90.0})
+    gcode.parse_command("G01 X20")
+    check("G01 equivale a G1", servos.moves[-1] == {2: 20.0})
+    check("M114 retorna a posição", gcode.parse_command("M114") == {'X': 0, 'Y': 0, 'Z': 0})
+    check("linha vazia", gcode.parse_command("  ; só comentário") is None)
+
+    # Vários comandos na mesma linha
+    gcode, servos = new_interpreter()
+    gcode.parse_command("G1 X10 G1 Y30")
+    check("dois comandos na linha", servos.moves == [{2: 10.0}, {1: 30.0}])
+
+    # Checksum e número de linha
+    gcode, servos = new_interpreter()
+    gcode.parse_command(with_checksum("N1 G1 X10"))
+    check("N1 com checksum", gcode.line_number == 1 and len(servos.moves) == 1)
+    gcode.parse_command(b"N2 G1 X11")
+    check("N2 em bytes, sem checksum", gcode.line_number == 2)
+    expect_error(gcode, "N3 G1 X10*1", 10, "Checksum incorreto")
+    expect_error(gcode, "N3 G1 X10*", 10, "Checksum inválido")
+    expect_error(gcode, "N5 G1 X1", 1, "fora de sequência")
+    check("linha rejeitada não avança N", gcode.line_number == 2)
+    gcode.parse_command(with_checksum("N100 M110 N10"))
+    check("M110 redefine N", gcode.line_number == 10)
+    gcode.parse_command("N11 G28")
+    check("sequência após M110", gcode.line_number == 11)
+
+    # N só é confirmado depois de validar a linha inteira
+    gcode, servos = new_interpreter()
+    expect_error(gcode, "N1 M999", 4, "Comando desconhecido M999")
+    check("N não avança com comando desconhecido", gcode.line_number == 0)
+    gcode.parse_command("N1 G28")
+    check("reenvio de N1 aceito", gcode.line_number == 1)
+
+    # Nada é executado se qualquer comando da linha for inválido
+    gcode, servos = new_interpreter()
+    expect_error(gcode, "G1 X10 G1 X500", 11, "fora dos limites")
+    check("nenhum movimento executado", servos.moves == [])
+
+    # Opcodes grandes não colidem com comandos existentes
+    expect_error(gcode, "G65536", 1, "Comando desconhecido G65536")
+    expect_error(gcode, "G393216", 1, "Comando desconhecido")
+    expect_error(gcode, "G65537 X1", 1, "Comando desconhecido")
+    check("nenhum movimento executado", servos.moves == [])
+
+    # Colunas de erro apontam a palavra exata
+    expect_error(gcode, "G1 X1e2", 6, "Parâmetro E não suportado")
+    expect_error(gcode, "G1 Xinf", 4, "Valor ausente")
+    expect_error(gcode, "G1 Q1", 4, "não suportado")
+    expect_error(gcode, "G1 X1 X2", 7, "repetido")
+    expect_error(gcode, "X1", 1, "sem comando")
+    expect_error(gcode, "G1 X-", 4, "Valor inválido")
+    expect_error(gcode, "G1 X1 &", 7, "Caractere inesperado")
+    expect_error(gcode, "G7", 1, "Comando desconhecido")
+    expect_error(gcode, "G", 1, "Código inválido")
+    expect_error(gcode, "G1 (aberto X1", 4, "Comentário")
+    expect_error(gcode, "M110 N1.5", 6, "Número de linha inválido")
+
+    # Palavras coladas, '*' em comentários, G28 por eixo
+    gcode, servos = new_interpreter()
+    gcode.parse_command("G1X10Y50")
+    check("G1X10Y50 sem espaços", servos.moves[-1] == {2: 10.0, 1: 50.0})
+    gcode.parse_command("G1 X20Y40")
+    check("G1 X20Y40", servos.moves[-1] == {2: 20.0, 1: 40.0})
+    gcode.parse_command("g1 x5 ; move*2")
+    check("'*' em comentário ';'", servos.moves[-1] == {2: 5.0})
+    gcode.parse_command("G1 X6 (a*b)")
+    check("'*' em comentário '()'", servos.moves[-1] == {2: 6.0})
+    gcode.parse_command(with_checksum("N1 G1 X7 (a*b)"))
+    check("checksum após comentário com '*'", servos.moves[-1] == {2: 7.0} and gcode.line_number == 1)
+    gcode.parse_command("G28 X")
+    check("G28 X leva só X para home", servos.moves[-1] == {2: 50})
+    gcode.parse_command("G28")
+    check("G28 leva todos os eixos", len(servos.moves[-1]) == 3)
+    expect_error(gcode, "G28 X5 X", 8, "repetido")
+    expect_error(gcode, "G1 X", 4, "Valor ausente")
+
+    # Dígitos não ASCII viram GCodeError com coluna
+    expect_error(gcode, "G²", 1, "Código inválido")
+    expect_error(gcode, "N² G1", 1, "Número de linha inválido")
+    expect_error(gcode, "G1 X1*²", 6, "Checksum inválido")
+    expect_error(gcode, "G1 X²", 4, "Valor ausente")
+
+    # Coluna do comando que falhou, mesmo com comandos iguais na linha
+    gcode, servos = new_interpreter()
+    runs = []
+
+    def coolant(params):
+        runs.append(params)
+        if len(runs) == 2:
+            raise GCodeError("falhou", param='S')
+
+    gcode.register('M7', coolant, params={'S': None})
+    expect_error(gcode, "M7 S1 M7 S1", 10, "falhou")
+
+    # Extensões
+    gcode, servos = new_interpreter()
+    gcode.register('M3', lambda params: ('spindle', params), params={'S': {'min': 0, 'max': 1000}})
+    check("handler registrado", gcode.parse_command("M3 S100") == ('spindle', {'S': 100.0}))
+    expect_error(gcode, "M3 S2000", 4, "fora dos limites")
+    try:
+        gcode.register('X1', print)
+        check("register rejeita opcode inválido", False)
+    except ValueError:
+        check("register rejeita opcode inválido", True)
+
+    print(f"\n{failures} falha(s)")
+    raise SystemExit(1 if failures else 0)
@@ -0,0 +1,144 @@
+# check_servos.py
+# Verificação do autoteste de servos sem hardware, com um barramento I2C
+# falso: agrupamento em blocos, contagem de erros, leitura de volta,
+# last_position e validação de duty_block/duties.
+#
+# Uso: python check_servos.py (CPython ou MicroPython)
+
+import sys
+import time
+
+# No CPython faltam ustruct e as funções ticks_* do MicroPython
+try:
+    import ustruct
+except ImportError:
+    import struct
+    sys.modules['ustruct'] = struct
+if not hasattr(time, 'ticks_us'):
+    time.ticks_us = lambda: time.perf_counter_ns() // 1000
+    time.ticks_ms = lambda: time.perf_counter_ns() // 1000000
+    time.ticks_diff = lambda end, start: end - start
+    time.sleep_ms = lambda ms: time.sleep(ms / 1000)
+    time.sleep_us = lambda us: time.sleep(us / 1000000)
+
+from servo import Servos
+
+
+class FakeI2C:
+    """Substitui machine.I2C: memória de registradores com falhas sob demanda"""
+    def __init__(self):
+        self.mem = bytearray(256)
+        self.writes = []            # (registrador, bytes) de cada escrita
+        self.fail_writes = set()    # Registradores cuja escrita falha
+        self.fail_reads = set()     # Registradores cuja leitura falha
+
+    def writeto_mem(self, address, register, data):
+        if register in self.fail_writes:
+            raise OSError(5)  # EIO
+        self.writes.append((register, len(data)))
+        self.mem[register:register + len(data)] = data
+
+    def readfrom_mem(self, address, register, count):
+        if register in self.fail_reads:
+            raise OSError(5)
+        return bytes(self.mem[register:register + count])
+
+
+def led(channel):
+    """Registrador LEDn_ON_L do canal"""
+    return 0x06 + 4 * channel
+
+
+failures = 0
+
+
+def check(label, condition):
+    global failures
+    if not condition:
+        failures += 1
+    print(f"{'ok  ' if condition else 'FALHA'} {label}")
+
+
+def expect_value_error(label, func, *args, **kwargs):
+    try:
+        func(*args, **kwargs)
+    except ValueError as e:
+        check(f"{label} -> {e}", True)
+        return
+    check(f"{label} deveria falhar", False)
+
+
+def new_servos():
+    bus = FakeI2C()
+    servos = Servos(bus)
+    bus.writes = []  # Descarta as escritas de reset()/freq()
+    return servos, bus
+
+
+if __name__ == "__main__":
+    # Um bloco por faixa contígua de canais, uma escrita por bloco e passo
+    servos, bus = new_servos()
+    report = servos.self_test([6, 0, 1, 2, 5, 9, 1], pattern='step', settle=0)
+    expected = [(led(0), 12), (led(5), 8), (led(9), 4)] * 3
+    check("blocos 0-2, 5-6 e 9 por passo", bus.writes == expected)
+    check("canais repetidos contam uma vez", sorted(report['channels']) == [0, 1, 2, 5, 6, 9])
+    check("relatório ok", report['ok'] and report['pattern'] == 'step')
+    check("3 escritas por canal", all(c['writes'] == 3 for c in report['channels'].values()))
+    check("sem erros", all(c['errors'] == 0 for c in report['channels'].values()))
+    check("leitura de volta confere", all(c['readback'] for c in report['channels'].values()))
+    block = [report['channels'][index] for index in (0, 1, 2)]
+    check("tempos iguais dentro do bloco (por transação)",
+          all((c['avg_us'], c['max_us']) == (block[0]['avg_us'], block[0]['max_us']) for c in block))
+    check("last_position no fim do padrão", all(servos.last_position[i] == 0 for i in report['channels']))
+
+    # Varredura: 0, subida, descida e 0, a cada `step` graus
+    servos, bus = new_servos()
+    report = servos.self_test([3], pattern='sweep', step=45, step_delay=0, settle=0)
+    check("sweep com passo 45", report['channels'][3]['writes'] == len([0, 45, 90, 135, 180, 135, 90, 45, 0]))
+    report = servos.self_test([3], pattern='hold', hold=0)
+    check("hold termina no centro", servos.last_position[3] == 90 and report['ok'])
+
+    # Falha de escrita em um bloco: só os canais dele contam erros
+    servos, bus = new_servos()
+    bus.fail_writes.add(led(5))
+    report = servos.self_test([0, 1, 5, 6], pattern='step', settle=0)
+    channels = report['channels']
+    check("falha reprova o relatório", not report['ok'])
+    check("erros só no bloco 5-6", [channels[i]['errors'] for i in (0, 1, 5, 6)] == [0, 0, 3, 3])
+    check("escritas contam tentativas", channels[5]['writes'] == 3)
+    check("leitura de volta detecta a falha", channels[0]['readback'] and not channels[5]['readback'])
+    check("last_position só para canais confirmados",
+          0 in servos.last_position and 5 not in servos.last_position and 6 not in servos.last_position)
+
+    # Falha só na leitura de volta
+    servos, bus = new_servos()
+    bus.fail_reads.add(led(8))
+    report = servos.self_test([8, 9], pattern='step', settle=0)
+    check("erro de leitura conta e reprova",
+          not report['ok'] and report['channels'][9]['errors'] == 1
+          and report['channels'][9]['readback'] is False)
+
+    # duty_block/duties: codificação e limites
+    servos, bus = new_servos()
+    servos.pca9685.duty_block(3, [0, 100, 4095])
+    check("duty_block em uma escrita", bus.writes == [(led(3), 12)])
+    check("duties lê o que foi escrito", servos.pca9685.duties(3, 3) == [0, 100, 4095])
+    check("duty 0 desliga (full off)", bus.mem[led(3):led(3) + 4] == bytes([0, 0, 0, 16]))
+    expect_value_error("duty_block além do canal 15", servos.pca9685.duty_block, 15, [1, 2])
+    expect_value_error("duty_block com início negativo", servos.pca9685.duty_block, -1, [1])
+    expect_value_error("duty_block com valor > 4095", servos.pca9685.duty_block, 0, [4096])
+    expect_value_error("duties além do canal 15", servos.pca9685.duties, 14, 3)
+    check("nada escrito fora dos limites", bus.writes == [(led(3), 12)])
+
+    # Parâmetros inválidos
+    expect_value_error("sem canais", servos.self_test, [])
+    expect_value_error("canal 16", servos.self_test, [16])
+    expect_value_error("step = 0", servos.self_test, [0], step=0)
+    expect_value_error("step negativo", servos.self_test, [0], step=-10)
+    expect_value_error("settle negativo", servos.self_test, [0], settle=-1)
+    expect_value_error("hold negativo", servos.self_test, [0], pattern='hold', hold=-1)
+    expect_value_error("padrão desconhecido", servos.self_test, [0], pattern='zigzag')
+    check("parâmetros inválidos não escrevem", bus.writes == [(led(3), 12)])
+
+    print(f"\n{failures} falha(s)")
+    raise SystemExit(1 if failures else 0)
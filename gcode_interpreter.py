@@ -1,14 +1,88 @@
-from servo import Servos
 import time
 from settings import *
 import math
 
+
+class GCodeError(ValueError):
+    """Erro de sintaxe ou de validação em uma linha G-code"""
+    def __init__(self, message, column=None, param=None):
+        if column is not None:
+            super().__init__(f"{message} (coluna {column})")
+        else:
+            super().__init__(message)
+        self.message = message
+        self.column = column
+        self.param = param  # Letra do parâmetro que causou o erro
+
+
+# Em `params` de register: letra que pode vir sem valor (ex.: G28 X)
+FLAG = 'flag'
+
+# Letras (bytes ASCII) que iniciam um comando e que podem ser parâmetros
+_OPCODE_LETTERS = frozenset(b'GMT')
+_PARAM_LETTERS = frozenset(b'ABCDEFHIJKLNOPQRSUVWXYZ')
+_SPACES = frozenset(b' \t\r\n')
+_NUMBER_BYTES = frozenset(b'0123456789.+-')
+
+# Faixa de um parâmetro sem limites e tabela usada quando o opcode não
+# restringe as letras: letra -> (min, max)
+_UNBOUNDED = (-float('inf'), float('inf'))
+_ANY_PARAMS = {chr(c): _UNBOUNDED for c in _PARAM_LETTERS}
+
+# Mapeamento eixo -> índice do servo
+_AXIS_TO_SERVO = {
+    'X': 2,  # X (comprimento) agora usa servo 2
+    'Y': 1,  # Y (altura) continua no servo 1
+    'Z': 0   # Z (base) agora usa servo 0
+}
+
+
+class _Opcode:
+    """Entrada da tabela de despacho"""
+    def __init__(self, name, handler, check, ranges, flags):
+        self.name = name        # Forma canônica, ex.: 'G1'
+        self.handler = handler
+        self.check = check
+        self.ranges = ranges    # Letra -> (min, max)
+        self.flags = flags      # Letras que aceitam valor vazio
+
+
+def _opcode_key(opcode):
+    """Normaliza um opcode ('g01' -> 'G1'); retorna None se inválido"""
+    letter = opcode[:1].upper()
+    # bytes.isdigit só aceita dígitos ASCII ('G²' é inválido)
+    code = opcode[1:].encode()
+    if len(letter) != 1 or ord(letter) not in _OPCODE_LETTERS or not code.isdigit():
+        return None
+    return letter + str(int(code))
+
+
+def _checksum(data):
+    """Checksum RepRap: XOR de todos os bytes"""
+    checksum = 0
+    for c in data:
+        checksum ^= c
+    return checksum
+
+
 class GCodeInterpreter:
     def __init__(self, servo):
         self.servo = servo
         self.axis_limits = AXIS_LIMITS
         self.current_position = HOME_POSITION.copy()
         self.current_speed = VELOCITY  # Usa velocidade do settings.py
+        self.line_number = 0  # Último número de linha (N) aceito
+
+        # Tabela de despacho: opcode canônico ('G1') -> _Opcode, extensível
+        # via register
+        self._opcodes = {}
+        move_params = dict(self.axis_limits)
+        move_params['F'] = None  # F (velocidade) é aceito e ignorado
+        self.register('G0', self.move_to, params=move_params)
+        self.register('G1', self.move_to, params=move_params)
+        self.register('G28', self._cmd_home, params={'X': FLAG, 'Y': FLAG, 'Z': FLAG})
+        self.register('M110', self._cmd_set_line_number, self._check_line_number)
+        self.register('M114', self._cmd_position)
         
         # Não move os servos na inicialização
         # Aguarda o setup() ser chamado explicitamente
@@ -22,58 +96,295 @@ class GCodeInterpreter:
         time.sleep(SETUP_DELAY)
         print("Setup completo!")
 
-    def _map_axis_to_servo(self, axis):
-        """Mapeia eixo para índice do servo"""
-        mapping = {
-            'X': 2,  # X (comprimento) agora usa servo 2
-            'Y': 1,  # Y (altura) continua no servo 1
-            'Z': 0   # Z (base) agora usa servo 0
-        }
-        return mapping.get(axis, None)
-
-    def _validate_position(self, axis, value):
-        """Valida se a posição está dentro dos limites"""
-        limits = self.axis_limits[axis]
-        if value < limits['min'] or value > limits['max']:
-            raise ValueError(f"Posição {value} fora dos limites para eixo {axis} ({limits['min']}-{limits['max']})")
-        return value
+    def register(self, opcode, handler, check=None, params=None):
+        """
+        Registra um handler para um opcode (ex.: 'M3').
+
+        O handler recebe o dicionário de parâmetros {letra: valor} e seu
+        retorno é devolvido por parse_command. `params` restringe as letras
+        aceitas: {letra: None} (qualquer número), {letra: {'min': ...,
+        'max': ...}} (mesmo formato de AXIS_LIMITS) ou {letra: FLAG} (valor
+        opcional; ausente vira None). Sem `params` qualquer letra é aceita.
+        O `check` opcional roda antes de qualquer comando da linha ser
+        executado e deve levantar GCodeError (com `param`) se os parâmetros
+        forem inválidos.
+        """
+        key = _opcode_key(opcode)
+        if key is None:
+            raise ValueError(f"Opcode inválido: {opcode!r}")
+        if params is None:
+            ranges = _ANY_PARAMS
+            flags = frozenset()
+        else:
+            ranges = {}
+            flags = set()
+            for letter, limits in params.items():
+                if len(letter) != 1 or ord(letter) not in _PARAM_LETTERS:
+                    raise ValueError(f"Parâmetro inválido: {letter!r}")
+                if limits is None or limits is FLAG:
+                    ranges[letter] = _UNBOUNDED
+                    if limits is FLAG:
+                        flags.add(letter)
+                else:
+                    ranges[letter] = (limits['min'], limits['max'])
+            flags = frozenset(flags)
+        self._opcodes[key] = _Opcode(key, handler, check, ranges, flags)
 
     def parse_command(self, command):
-        """Interpreta e executa comandos G-code"""
-        parts = command.upper().split()
-        if not parts:
-            return
-        
-        if parts[0] in ['G0', 'G1']:
-            positions = {}
-            for part in parts[1:]:
-                if part[0] in ['X', 'Y', 'Z']:
-                    axis = part[0]
-                    value = float(part[1:])
-                    positions[axis] = self._validate_position(axis, value)
-                # Removido o processamento do F (velocidade) para manter consistência
-            
-            self.move_to(positions)
-            
-        elif parts[0] == 'G28':
+        """
+        Interpreta e executa uma linha G-code (str ou bytes)
+
+        Aceita número de linha (N), checksum (*), comentários (';' e '()'),
+        palavras sem espaço ('G1X10Y50') e vários comandos na mesma linha.
+        Todos os comandos da linha são validados antes de qualquer um ser
+        executado.
+
+        A linha comum ('N12 G1 X10 Y50*34': um comando, palavras separadas
+        por espaço) é tratada aqui mesmo, com um split() e um float() por
+        palavra. Qualquer outra coisa (comentários, palavras coladas, vários
+        comandos, opcode não canônico ou com check, qualquer erro) vai para
+        _parse_full, sem nada ter sido executado, que reporta a coluna.
+        """
+        if not isinstance(command, str):
+            return self._parse_full(bytes(command))
+        data = command.encode()
+        up = command.upper()
+        # Só ASCII (float() aceitaria outros dígitos Unicode), sem expoente,
+        # inf/nan nem '_', que float() também aceitaria; comentários caem
+        # em _parse_full ao falhar na tabela de letras
+        if len(data) != len(command) or 'E' in up or '_' in up:
+            return self._parse_full(data, command)
+        if '*' in up:
+            star = up.find('*')
+            received = data[star + 1:].strip()
+            if not received.isdigit() or int(received) != _checksum(data[:star]):
+                return self._parse_full(data, command)
+            up = up[:star]
+        words = up.split()
+        if not words:
+            return self._parse_full(data, command)
+
+        line_number = None
+        if 'N' in up:
+            # Só o número de linha inicial; N como parâmetro (M110 N..) ou
+            # 'INF'/'NAN' ficam para _parse_full
+            number = words.pop(0)[1:]
+            if up.lstrip()[0] != 'N' or up.count('N') != 1 or not number.isdigit() or not words:
+                return self._parse_full(data, command)
+            line_number = int(number)
+
+        entry = self._opcodes.get(words[0])
+        if entry is None or entry.check is not None:
+            return self._parse_full(data, command)
+        ranges = entry.ranges
+        params = {}
+        try:
+            for word in words[1:]:
+                letter = word[0]
+                low, high = ranges[letter]
+                value = float(word[1:])
+                if value < low or value > high:
+                    return self._parse_full(data, command)
+                params[letter] = value
+        except (KeyError, ValueError):
+            # Letra desconhecida, outro comando na linha ou valor inválido
+            return self._parse_full(data, command)
+        if len(params) != len(words) - 1:
+            return self._parse_full(data, command)  # Letra repetida
+
+        if line_number is not None:
+            self._next_line(line_number, command)
+        try:
+            return entry.handler(params)
+        except GCodeError as e:
+            raise self._locate(e, command, 0, None)
+
+    def _parse_full(self, data, command=None):
+        """Interpreta a linha (bytes) com o tokenizador completo e executa"""
+        if command is None:
+            command = data
+        line_number, calls, columns = self._tokenize(data)
+        # Validações adicionais, antes de executar qualquer comando
+        for number, (entry, params) in enumerate(calls):
+            if entry.check is not None:
+                try:
+                    entry.check(params)
+                except GCodeError as e:
+                    raise self._locate(e, command, number, columns)
+        if line_number is not None:
+            if calls and calls[0][0].name == 'M110':
+                self.line_number = line_number
+            else:
+                self._next_line(line_number, command)
+
+        result = None
+        for number, (entry, params) in enumerate(calls):
+            try:
+                output = entry.handler(params)
+            except GCodeError as e:
+                raise self._locate(e, command, number, columns)
+            if output is not None:
+                result = output
+        return result
+
+    def _next_line(self, line_number, command):
+        """Aceita o número de linha (N) se for o próximo da sequência"""
+        if line_number != self.line_number + 1:
+            column = len(command) - len(command.lstrip()) + 1
+            raise GCodeError(f"Número de linha {line_number} fora de sequência, "
+                             f"esperado {self.line_number + 1}", column)
+        self.line_number = line_number
+
+    def _tokenize(self, data):
+        """
+        Tokenizador completo, em uma única passada sobre os bytes da linha.
+
+        Separa as palavras pelas letras (aceita 'G1X10Y50'), trata
+        comentários, número de linha e checksum, e aponta a coluna exata de
+        qualquer erro. Retorna (numero_de_linha, chamadas, colunas), onde
+        colunas[i] = (coluna do opcode, {letra: coluna}).
+        """
+        buf = memoryview(data)
+        n = len(buf)
+        i = 0
+        line_number = None
+        calls = []
+        columns = []
+        entry = None
+        checksum_at = -1
+        while i < n:
+            c = buf[i]
+            if c in _SPACES:
+                i += 1
+                continue
+            if c == 0x3B:  # ';' comenta o resto da linha
+                break
+            if c == 0x28:  # '(' comentário até ')'
+                start = i
+                while i < n and buf[i] != 0x29:
+                    i += 1
+                if i == n:
+                    raise GCodeError("Comentário sem ')'", start + 1)
+                i += 1
+                continue
+            if checksum_at >= 0:
+                raise GCodeError("Conteúdo após o checksum", i + 1)
+            column = i + 1
+            j = i + 1
+            if c == 0x2A:  # '*'
+                while j < n and 0x30 <= buf[j] <= 0x39:
+                    j += 1
+                if j == i + 1:
+                    raise GCodeError("Checksum inválido", column)
+                received = int(bytes(buf[i + 1:j]))
+                checksum = _checksum(buf[:i])
+                if received != checksum:
+                    raise GCodeError(f"Checksum incorreto: recebido {received}, "
+                                     f"calculado {checksum}", column)
+                checksum_at = i
+                i = j
+                continue
+
+            if 0x61 <= c <= 0x7A:
+                c -= 0x20  # maiúscula
+            if c not in _OPCODE_LETTERS and c not in _PARAM_LETTERS:
+                raise GCodeError(f"Caractere inesperado {chr(c)!r}", column)
+            while j < n and buf[j] in _NUMBER_BYTES:
+                j += 1
+            text = bytes(buf[i + 1:j])
+            letter = chr(c)
+
+            if c in _OPCODE_LETTERS:
+                key = _opcode_key(letter + text.decode())
+                if key is None:
+                    raise GCodeError(f"Código inválido {letter}{text.decode()}", column)
+                entry = self._opcodes.get(key)
+                if entry is None:
+                    raise GCodeError(f"Comando desconhecido {key}", column)
+                params = {}
+                param_columns = {}
+                calls.append((entry, params))
+                columns.append((column, param_columns))
+            elif c == 0x4E and entry is None and line_number is None:
+                if not text.isdigit():
+                    raise GCodeError("Número de linha inválido", column)
+                line_number = int(text)
+            elif entry is None:
+                raise GCodeError(f"Parâmetro {letter} sem comando", column)
+            else:
+                limits = entry.ranges.get(letter)
+                if limits is None:
+                    raise GCodeError(f"Parâmetro {letter} não suportado em {entry.name}", column)
+                low, high = limits
+                if letter in params:
+                    raise GCodeError(f"Parâmetro {letter} repetido", column)
+                if text:
+                    try:
+                        value = float(text)
+                    except ValueError:
+                        raise GCodeError(f"Valor inválido para {letter}: {text.decode()!r}", column)
+                    if not low <= value <= high:
+                        raise GCodeError(f"Valor {value} fora dos limites para {letter} "
+                                         f"({low}-{high})", column)
+                elif letter in entry.flags:
+                    value = None
+                else:
+                    raise GCodeError(f"Valor ausente para {letter}", column)
+                params[letter] = value
+                param_columns[letter] = column
+            i = j
+        return line_number, calls, columns
+
+    def _locate(self, error, command, number, columns):
+        """Completa a coluna de um GCodeError levantado por check/handler"""
+        if error.column is not None:
+            return error
+        if columns is None:
+            # O caminho rápido não guarda colunas; refaz com o completo
+            data = command.encode() if isinstance(command, str) else command
+            columns = self._tokenize(data)[2]
+        column, param_columns = columns[number]
+        column = param_columns.get(error.param, column)
+        return GCodeError(error.message, column, error.param)
+
+    def _cmd_home(self, params):
+        """G28: retorna à posição home (todos os eixos ou só os informados)"""
+        if params:
+            self.move_to({axis: HOME_POSITION[axis] for axis in params})
+        else:
             self.home()
-            
-        elif parts[0] == 'M114':
-            return self.get_position()
+
+    def _cmd_position(self, params):
+        """M114: retorna a posição atual"""
+        return self.get_position()
+
+    def _check_line_number(self, params):
+        """M110: valida o número de linha informado em N"""
+        value = params.get('N')
+        if value is not None and (value != int(value) or value < 0):
+            raise GCodeError("Número de linha inválido em M110", param='N')
+
+    def _cmd_set_line_number(self, params):
+        """M110: define o número da linha atual"""
+        if 'N' in params:
+            self.line_number = int(params['N'])
 
     def move_to(self, positions):
         """Move todos os servos simultaneamente para as posições especificadas"""
         servo_positions = {}
         for axis, target in positions.items():
-            servo_index = self._map_axis_to_servo(axis)
+            servo_index = _AXIS_TO_SERVO.get(axis)
             if servo_index is not None:
                 servo_positions[servo_index] = target
         
         # Move todos os servos de uma vez
         self.servo.position_all(servo_positions)
         
-        # Atualiza as posições atuais
-        self.current_position.update(positions)
+        # Atualiza as posições atuais (ignora parâmetros que não são eixos, ex.: F)
+        current = self.current_position
+        for axis in positions:
+            if axis in _AXIS_TO_SERVO:
+                current[axis] = positions[axis]
 
     def home(self):
         """Move todos os eixos para a posição inicial com velocidade controlada"""
@@ -75,4 +75,39 @@ class PCA9685:
         elif value == 4095:
             self.pwm(index, 4096, 0)
         else:
-            self.pwm(index, 0, value)
\ No newline at end of file
+            self.pwm(index, 0, value)
+
+    def duty_block(self, start, values):
+        """
+        Sets the duty of consecutive channels, starting at `start`, with a
+        single I2C write (relies on register auto-increment, see freq())
+        """
+        if not (0 <= start and start + len(values) <= 16):
+            raise ValueError("Out of range")
+        data = bytearray(4 * len(values))
+        for i, value in enumerate(values):
+            if not 0 <= value <= 4095:
+                raise ValueError("Out of range")
+            if value == 0:
+                ustruct.pack_into('<HH', data, 4 * i, 0, 4096)
+            elif value == 4095:
+                ustruct.pack_into('<HH', data, 4 * i, 4096, 0)
+            else:
+                ustruct.pack_into('<HH', data, 4 * i, 0, value)
+        self.i2c.writeto_mem(self.address, 0x06 + 4 * start, data)
+
+    def duties(self, start, count):
+        """Reads back the duty of `count` consecutive channels in one read"""
+        if not (0 <= start and start + count <= 16):
+            raise ValueError("Out of range")
+        data = self.i2c.readfrom_mem(self.address, 0x06 + 4 * start, 4 * count)
+        values = []
+        for i in range(count):
+            on, off = ustruct.unpack_from('<HH', data, 4 * i)
+            if (on, off) == (0, 4096):
+                values.append(0)
+            elif (on, off) == (4096, 0):
+                values.append(4095)
+            else:
+                values.append(off)
+        return values
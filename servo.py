@@ -71,18 +71,129 @@ class Servos:
         """
         Move all servos from min to max position and back to test functionality.
         """
-        for index in range(16):  # Assuming 16 channels on the PCA9685
-            # Move to minimum position
-            self.position(index, degrees=0)
-            time.sleep(1)  # Wait for 1 second
-
-            # Move to maximum position
-            self.position(index, degrees=self.degrees)
-            time.sleep(1)  # Wait for 1 second
-
-            # Return to minimum position
-            self.position(index, degrees=0)
-            time.sleep(1)  # Wait for 1 second    
+        return self.self_test(range(16), pattern='step')
+
+    def _runs(self, channels):
+        """Agrupa os canais em blocos contíguos [(inicio, quantidade), ...]"""
+        runs = []
+        for index in sorted(set(channels)):
+            if not 0 <= index < 16:
+                raise ValueError(f"Canal {index} fora do intervalo 0-15")
+            if runs and runs[-1][0] + runs[-1][1] == index:
+                runs[-1][1] += 1
+            else:
+                runs.append([index, 1])
+        return runs
+
+    def _test_timeline(self, pattern, step, step_delay, settle, hold):
+        """Retorna a linha do tempo do padrão: [(graus, espera_ms), ...]"""
+        if step <= 0:
+            raise ValueError(f"Passo deve ser positivo: {step}")
+        if step_delay < 0 or settle < 0 or hold < 0:
+            raise ValueError("Tempos de espera não podem ser negativos")
+        step_ms = int(step_delay * 1000)
+        settle_ms = int(settle * 1000)
+        center = self.degrees // 2
+        if pattern == 'sweep':
+            timeline = [(0, settle_ms)]
+            timeline += [(a, step_ms) for a in range(step, self.degrees, step)]
+            timeline += [(a, step_ms) for a in range(self.degrees, 0, -step)]
+            timeline.append((0, settle_ms))
+        elif pattern == 'step':
+            timeline = [(0, settle_ms), (self.degrees, settle_ms), (0, settle_ms)]
+        elif pattern == 'hold':
+            timeline = [(center, int(hold * 1000))]
+        else:
+            raise ValueError(f"Padrão desconhecido: {pattern}")
+        return timeline
+
+    def self_test(self, channels=range(16), pattern='sweep', step=10,
+                  step_delay=0.02, settle=0.5, hold=1.0):
+        """
+        Autoteste simultâneo de vários canais
+
+        Todos os canais seguem a mesma linha do tempo e cada bloco de canais
+        contíguos é escrito com uma única transação I2C. Ao final os
+        registradores são lidos de volta e comparados com o último valor
+        escrito.
+
+        :param channels: canais a testar
+        :param pattern: 'sweep' (0 -> máx -> 0), 'step' (degraus 0/máx/0)
+                        ou 'hold' (mantém no centro)
+        :param step: passo em graus do padrão 'sweep'
+        :param step_delay: espera entre passos do 'sweep' (s)
+        :param settle: espera após cada degrau (s)
+        :param hold: tempo de permanência do padrão 'hold' (s)
+        :return: relatório {'pattern', 'duration_ms', 'ok', 'channels':
+                 {canal: {'writes', 'errors', 'avg_us', 'max_us',
+                 'readback'}}}
+        
+        'avg_us' e 'max_us' medem a transação I2C inteira, não o canal: todos
+        os canais de um mesmo bloco contíguo recebem os mesmos tempos. Para
+        medir um canal isoladamente, teste-o sozinho (channels=[n]).
+        """
+        runs = self._runs(channels)
+        if not runs:
+            raise ValueError("Nenhum canal para testar")
+        timeline = self._test_timeline(pattern, step, step_delay, settle, hold)
+        final_degrees = timeline[-1][0]
+        # Estatísticas por canal: [escritas, erros, total_us, max_us,
+        # última escrita ok]
+        stats = {index: [0, 0, 0, 0, False] for start, count in runs
+                 for index in range(start, start + count)}
+
+        t_start = time.ticks_ms()
+        duty = 0
+        for degrees, wait_ms in timeline:
+            duty = int(self._angle_to_duty(degrees))
+            for start, count in runs:
+                t0 = time.ticks_us()
+                try:
+                    self.pca9685.duty_block(start, [duty] * count)
+                    failed = False
+                except OSError:
+                    failed = True
+                elapsed = time.ticks_diff(time.ticks_us(), t0)
+                for index in range(start, start + count):
+                    entry = stats[index]
+                    entry[0] += 1
+                    entry[1] += failed
+                    entry[2] += elapsed
+                    if elapsed > entry[3]:
+                        entry[3] = elapsed
+                    entry[4] = not failed
+            time.sleep_ms(wait_ms)
+
+        readback = {}
+        for start, count in runs:
+            try:
+                values = self.pca9685.duties(start, count)
+            except OSError:
+                values = [None] * count
+                for index in range(start, start + count):
+                    stats[index][1] += 1
+            for offset, value in enumerate(values):
+                readback[start + offset] = value == duty
+
+        report = {
+            'pattern': pattern,
+            'duration_ms': time.ticks_diff(time.ticks_ms(), t_start),
+            'ok': True,
+            'channels': {},
+        }
+        for index, (writes, errors, total_us, max_us, last_ok) in stats.items():
+            report['channels'][index] = {
+                'writes': writes,
+                'errors': errors,
+                'avg_us': total_us // writes if writes else 0,
+                'max_us': max_us,
+                'readback': readback[index],
+            }
+            if errors or not readback[index]:
+                report['ok'] = False
+            if last_ok:
+                self.last_position[index] = final_degrees
+        return report
 
     def release(self, index):
         """Desliga o servo"""